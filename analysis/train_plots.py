@@ -16,6 +16,8 @@ import os
 import json
 import argparse
 import numpy as np
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import statsmodels.api as sm
@@ -60,6 +62,18 @@ def get_arguments():
     return parser.parse_args()
 
 
+def load_json(file_path):
+    data = Path(file_path).read_bytes()
+    try:
+        json_data = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # logs written by the stdlib may hold NaN tokens
+        json_data = json.loads(data)
+    # keeps only the plotted series: the whole log is released
+    # as soon as the file is parsed.
+    return {k: json_data[k] for k in ('rewards', 'vehicles', 'velocities')}
+
+
 def main(experiment_root_folder=None):
 
     print('\nRUNNING analysis/train_plots.py\n')
@@ -84,12 +98,12 @@ def main(experiment_root_folder=None):
     vehicles = []
     velocities = []
 
-    # Concatenate data for all runs.
-    for run_name in train_files:
+    # Load JSON data: files are independent, reads are overlapped.
+    with ThreadPoolExecutor(max_workers=min(32, len(train_files) or 1)) as ex:
+        runs = list(ex.map(load_json, train_files))
 
-        # Load JSON data.
-        with open(run_name) as f:
-            json_data = json.load(f)
+    # Concatenate data for all runs.
+    for json_data in runs:
 
         # Rewards per time-step.
         r = json_data['rewards']
@@ -138,7 +152,8 @@ def main(experiment_root_folder=None):
     """ 
         Number of vehicles per time-step.
     """
-    vehicles = np.array(vehicles)
+    # NaNs are stored as null
+    vehicles = np.array(vehicles, dtype=float)
 
     fig = plt.figure()
     fig.set_size_inches(FIGURE_X, FIGURE_Y)
@@ -170,7 +185,7 @@ def main(experiment_root_folder=None):
     """ 
         Vehicles' velocity per time-step.
     """
-    velocities = np.array(velocities)
+    velocities = np.array(velocities, dtype=float)
 
     fig = plt.figure()
     fig.set_size_inches(FIGURE_X, FIGURE_Y)
@@ -13,19 +13,23 @@
 from pathlib import Path
 import warnings
 import datetime
-import json
 import logging
 from os import environ
+import sys
 import tempfile
 import time
 from collections import defaultdict
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 
 from tqdm import tqdm
 
 import numpy as np
+import orjson
 from flow.core.util import emission_to_csv
 
+from ilurl.core._fast import flush, mean
+from ilurl.utils.serialize import serialize
+
 # TODO: Track those anoying warning
 warnings.filterwarnings('ignore')
 
@@ -34,6 +38,9 @@ ILURL_PATH = Path(environ['ILURL_HOME'])
 
 EMISSION_PATH = ILURL_PATH / 'data/emissions/'
 
+# numpy values are serialized natively; NaNs are written as null
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
 class Experiment:
     """
     Class for systematically running simulations in any supported simulator.
@@ -120,6 +127,23 @@ class Experiment:
         self.save_agent = save_agent
         self.save_agent_interval = save_agent_interval
 
+        # per step buffers: vehicles and velocities are
+        # aggregated between two consecutive save steps
+        self._save_n = int(np.ceil(self.save_step))
+        self._veh_buf = np.empty(self._save_n)
+        self._vel_buf = np.empty(self._save_n)
+        self._buf_i = 0
+
+        # save flags are evaluated once per step by `_check_flags`
+        self._step = 0
+        self._save_mod = self._save_n
+        self._save_q = bool(save_agent and train and
+                            hasattr(env, 'dump') and self.dir_path)
+
+        # background Q-table writer: one per `run`
+        self._io_pool = None
+        self._io_pending = None
+
         logging.info(" Starting experiment {} at {}".format(
             env.network.name, str(datetime.datetime.utcnow())))
 
@@ -173,83 +197,108 @@ class Experiment:
         info_dict["cycle"] = self.cycle
         info_dict["save_step"] = self.save_step
 
-        vels = []
-        vehs = []
-        observation_spaces = []
+        # one entry per save step: indexed by agent_updates_counter
+        num_saves = num_steps // max(1, int(self.save_step)) + 1
+        vels = np.empty(num_saves)
+        vehs = np.empty(num_saves)
+        # rewards' rows are as wide as the reward function returns
         rewards = []
-
-        veh_i = []
-        vel_i = []
+        observation_spaces = []
 
         agent_updates_counter = 0
-
-        state = self.env.reset()
-
-        for _ in tqdm(range(num_steps)):                
-
-            state, reward, done, _ = self.env.step(rl_actions(state))
-
-            veh_i.append(len(self.env.k.vehicle.get_ids()))
-            vel_i.append(
-                np.nanmean(self.env.k.vehicle.get_speed(
-                    self.env.k.vehicle.get_ids()
-                    )
-                )
-            )
-
-            if self._is_save_step():
-
-                observation_spaces.append(
-                    list(self.env.get_observation_space()))
-
-                try:
-                    rewards.append([round(r, 4) for r in reward])
-                except Exception:
-                    import pdb
-                    pdb.set_trace()
-
-                vehs.append(np.nanmean(veh_i).round(4))
-                vels.append(np.nanmean(vel_i).round(4))
-                veh_i = []
-                vel_i = []
-
-                agent_updates_counter += 1
-                # Save train log.
-                if self.log_info and \
-                    (agent_updates_counter % self.log_info_interval == 0):
-
-                    file_path = self.dir_path / f"{self.env.network.name}.train.json"
-
-                    info_dict["rewards"] = rewards
-                    info_dict["velocities"] = vels
-                    info_dict["vehicles"] = vehs
-                    info_dict["observation_spaces"] = observation_spaces
-                    info_dict["rl_actions"] = list(self.env.actions_log.values())
-                    info_dict["states"] = list(self.env.states_log.values())
-                    info_dict["explored"] = getattr(self.env.agent, 'explored', None)
-                    info_dict["visited_states"] = getattr(self.env.agent, 'visited_states', None)
-                    info_dict["Q_distances"] = getattr(self.env.agent, 'Q_distances', None)
-
-                    with file_path.open('w') as fj:
-                        t = Thread(target=json.dump(info_dict, fj))
-                        t.start()
-
-            if done and stop_on_teleports:
-                break
-
-            if self.save_agent and self._is_save_q_table_step(agent_updates_counter):
-                filename = \
-                    f'{self.env.network.name}.Q.1-{agent_updates_counter}.pickle'
-                
-                t = Thread(
-                    target=self.env.dump(self.dir_path.as_posix(),
-                                         filename, attr_name='Q')
-                )
-                t.start()
-
-        info_dict["rewards"] = rewards
-        info_dict["velocities"] = vels
-        info_dict["vehicles"] = vehs
+        self._buf_i = 0
+        self._step = 0
+
+        # Q-tables are written on the background while the
+        # simulation proceeds -- at most one write is pending.
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        self._io_pending = None
+
+        try:
+            state = self.env.reset()
+
+            # hoists attribute lookups out of the step loop
+            kv = self.env.k.vehicle
+            check_flags = self._check_flags
+
+            if self._save_q:
+                self._dump_q_table(agent_updates_counter)
+
+            # refreshes the progress bar at most once per second
+            # and only when attached to a terminal
+            steps = tqdm(range(num_steps),
+                         miniters=max(1, num_steps // 1000),
+                         mininterval=1.0,
+                         disable=not sys.stderr.isatty())
+            for _ in steps:
+
+                state, reward, done, _ = self.env.step(rl_actions(state))
+
+                speeds = kv.get_speed(kv.get_ids())
+                # cycle time save steps might be further
+                # apart than `save_step` steps.
+                if self._buf_i == self._save_n:
+                    self._grow_buffers()
+                # vehicles on the network always report a speed
+                n = len(speeds)
+                self._veh_buf[self._buf_i] = n
+                self._vel_buf[self._buf_i] = \
+                    sum(speeds) / n if n > 0 else np.nan
+                self._buf_i += 1
+
+                save, save_q = check_flags(agent_updates_counter)
+                if save:
+
+                    observation_spaces.append(
+                        list(self.env.get_observation_space()))
+
+                    # keeps full precision: rounds only on output
+                    rewards.append([float(r) for r in reward])
+                    vehs[agent_updates_counter] = \
+                        mean(self._veh_buf, self._buf_i)
+                    vels[agent_updates_counter] = \
+                        flush(self._vel_buf, self._buf_i)
+                    self._buf_i = 0
+
+                    agent_updates_counter += 1
+                    # Save train log.
+                    if self.log_info and \
+                        (agent_updates_counter % self.log_info_interval == 0):
+
+                        file_path = self.dir_path / f"{self.env.network.name}.train.json"
+                        n = agent_updates_counter
+
+                        info_dict["rewards"] = [[round(r, 4) for r in row] for row in rewards]
+                        info_dict["velocities"] = np.round(vels[:n], 4).tolist()
+                        info_dict["vehicles"] = np.round(vehs[:n], 4).tolist()
+                        info_dict["observation_spaces"] = observation_spaces
+                        info_dict["rl_actions"] = list(self.env.actions_log.values())
+                        info_dict["states"] = list(self.env.states_log.values())
+                        info_dict["explored"] = getattr(self.env.agent, 'explored', None)
+                        info_dict["visited_states"] = getattr(self.env.agent, 'visited_states', None)
+                        info_dict["Q_distances"] = getattr(self.env.agent, 'Q_distances', None)
+
+                        file_path.write_bytes(
+                            orjson.dumps(info_dict, option=JSON_OPTIONS))
+
+                if done and stop_on_teleports:
+                    break
+
+                if save_q:
+                    self._dump_q_table(agent_updates_counter)
+        finally:
+            # waits for the pending write
+            self._io_pool.shutdown(wait=True)
+
+        # raises errors from the pending write -- only when
+        # no error is already propagating from the loop
+        if self._io_pending is not None:
+            self._io_pending.result()
+
+        n = agent_updates_counter
+        info_dict["rewards"] = [[round(r, 4) for r in row] for row in rewards]
+        info_dict["velocities"] = np.round(vels[:n], 4).tolist()
+        info_dict["vehicles"] = np.round(vehs[:n], 4).tolist()
         info_dict["observation_spaces"] = observation_spaces
         info_dict["rl_actions"] = list(self.env.actions_log.values())
         info_dict["states"] = list(self.env.states_log.values())
@@ -261,12 +310,46 @@ class Experiment:
 
         return info_dict
 
-    def _is_save_step(self):
-        if self.cycle is not None:
-            return self.env.duration == 0.0
-        return self.step_counter % self.save_step == 0
+    def _check_flags(self, counter):
+        """Evaluates the save predicates once per step
+
+        Params:
+        ------
+        * counter: integer
+            number of agent updates performed before this step
 
-    def _is_save_q_table_step(self, counter):
-        if counter % self.save_agent_interval == 0:
-            return self.train and hasattr(self.env, 'dump') and self.dir_path
-        return False
+        Returns:
+        -------
+        * save: bool
+            whether the step is a save step (agent update)
+        * save_q: bool
+            whether the Q-table should be dumped after this
+            step's agent update
+        """
+        self._step += 1
+        if self.cycle is not None:
+            save = self.env.duration == 0.0
+        else:
+            save = self._step % self._save_mod == 0
+
+        save_q = save and self._save_q and \
+            (counter + 1) % self.save_agent_interval == 0
+        return save, save_q
+
+    def _grow_buffers(self):
+        """Doubles the per step buffers keeping their contents"""
+        self._veh_buf = np.concatenate((self._veh_buf,
+                                        np.empty(self._save_n)))
+        self._vel_buf = np.concatenate((self._vel_buf,
+                                        np.empty(self._save_n)))
+        self._save_n *= 2
+
+    def _dump_q_table(self, counter):
+        """Snapshots the Q-table and writes it on the background"""
+        file_path = self.dir_path / f'{self.env.network.name}.Q.1-{counter}.pickle'
+        snapshot = serialize(self.env.Q)
+        if self._io_pending is not None:
+            # raises errors from the previous write
+            self._io_pending.result()
+        self._io_pending = \
+            self._io_pool.submit(file_path.write_bytes, snapshot)
@@ -379,14 +379,14 @@ class InFlows(flow_params.InFlows):
             edges_distribution = initial_config.edges_distribution
         else:
             edges_distribution = None
-        edges = get_edges(network_id)
+        edges = {e['id']: e for e in get_edges(network_id)}
         # an array of kwargs
         params = []
         for eid in get_routes(network_id):
             # use edges distribution to filter routes
             if ((edges_distribution is None) or
                (edges_distribution and eid in edges_distribution)):
-                edge = [e for e in edges if e['id'] == eid][0]
+                edge = edges[eid]
 
                 num_lanes = edge['numLanes'] if 'numLanes' in edge else 1
 
@@ -74,7 +74,7 @@ def inflows_dump(network_id, inflows,
     """
     # load network data
     routes = get_routes(network_id)
-    edges = get_edges(network_id)
+    edges = {e['id']: e for e in get_edges(network_id)}
     # sort by begin
     inflows_sorted = sorted(inflows.get(), key=lambda d: d['begin'])
     horizon = max([int(ii['end']) for ii in inflows_sorted])
@@ -127,7 +127,7 @@ def inflows_dump(network_id, inflows,
         edge_id = inflows['edge']
 
         route_ids, route_ps = zip(*edges2routes[edge_id])
-        edge = [e for e in edges if e['id'] == edge_id][0]
+        edge = edges[edge_id]
 
         if inflows['departSpeed'] == 'random':
             max_speed = edge['speed']
@@ -4,20 +4,56 @@ __author__ = 'Guilherme Varela'
 __date__ = '2020-01-30'
 import os
 from operator import itemgetter
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
 import json
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 
 ILURL_HOME = os.environ['ILURL_HOME']
 
 DIR = \
     f'{ILURL_HOME}/data/networks/'
 
+@lru_cache(maxsize=None)
 def get_path(network_id, file_type):
-    rel_path = f'{network_id}/'
-    filename = f'{network_id}.{file_type}.xml'
-    return \
-        os.path.join(DIR, rel_path, filename)
+    return f'{DIR}{network_id}/{network_id}.{file_type}.xml'
+
+
+@lru_cache(maxsize=None)
+def _find_elements(file_path, target, child_key=None):
+    """Streams file_path collecting the attributes of target
+
+    target is a path relative to the root, e.g `vehicle/route`.
+    Elements are cleared as soon as they are consumed -- so memory
+    is bounded by the matches rather than by the whole document.
+
+    Returns:
+    -------
+    * elements: tuple<tuple<dict, tuple<dict>>>
+        attributes of each match and of its `child_key` children
+    """
+    *parents, tag = target.split('/')
+    path = []
+    elements = []
+    for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+        if event == 'start':
+            path.append(elem.tag)
+            continue
+
+        path.pop()
+        if elem.tag == tag and path[1:] == parents:
+            children = ()
+            if child_key is not None:
+                children = tuple(dict(chlem.attrib)
+                                 for chlem in elem.findall(child_key))
+            elements.append((dict(elem.attrib), children))
+
+        if len(path) == 1:
+            # top level element: releases it and its preceding siblings
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    return tuple(elements)
 
 
 def get_generic_element(network_id, target, file_type='net',
@@ -28,23 +64,27 @@ def get_generic_element(network_id, target, file_type='net',
     -----
     > # Returns a list of dicts representing the nodes
     > elements = get_generic_element('grid', 'junctions')
+
+    Remarks:
+    -------
+    The matches are cached -- elements' attributes are copied
+    so that callers are free to mutate the results.
     """
     # Parse xml recover target elements
     file_path = get_path(network_id, file_type)
     elements = []
 
     if os.path.isfile(file_path):
-        root = ET.parse(file_path).getroot()
-        for elem in root.findall(target):
-            if ignore not in elem.attrib:
-                if key in elem.attrib:
-                    elements.append(elem.attrib[key])
+        for attrib, children in _find_elements(file_path, target, child_key):
+            if ignore not in attrib:
+                if key in attrib:
+                    elements.append(attrib[key])
                 else:
-                    elements.append(elem.attrib)
+                    elements.append(dict(attrib))
 
                 if child_key is not None:
                     elements[-1][f'{child_key}s'] = \
-                        [chlem.attrib for chlem in elem.findall(child_key)]
+                        [dict(chlem) for chlem in children]
 
     return elements
 
@@ -79,29 +119,38 @@ def get_routes(network_id):
         ----------
         flow.networks.base
     """
-    # Parse xml to recover all generated routes
-    routes = get_generic_element(network_id, 'vehicle/route',
-                                 file_type='rou', key='edges')
+    # convert to equipropable array of tuples:
+    # (routes, probability) -- new lists on every call
+    routes = OrderedDict(
+        (k, [(list(r), 1 / len(rou)) for r in rou])
+        for k, rou in _get_routes(network_id)
+    )
+    return routes
 
-   
-    # unique routes as array of arrays
-    routes = [rou.split(' ') for rou in set(routes)]
 
-    # starting edges
-    keys = {rou[0] for rou in routes}
+@lru_cache(maxsize=None)
+def _get_routes(network_id):
+    """Unique routes grouped by their starting edges -- see `get_routes`
 
-    # match routes to it's starting edges
-    routes = {k: sorted([r for r in routes if k == r[0]])
-              for k in sorted(keys)}
+    Returns:
+    -------
+        * routes: tuple<tuple<string, tuple<tuple<string>>>>
+        sorted pairs of starting edge and routes
+    """
+    # Parse xml to recover all generated routes
+    routes = get_generic_element(network_id, 'vehicle/route',
+                                 file_type='rou', key='edges')
 
-    # convert to equipropable array of tuples:
-    # (routes, probability)
-    routes = OrderedDict({
-        k: [(r, 1 / len(rou)) for r in rou]
-        for k, rou in routes.items()
-    })
-    return routes
+    # unique routes grouped by their starting edges
+    groups = defaultdict(list)
+    seen = set()
+    for rou in routes:
+        if rou not in seen:
+            seen.add(rou)
+            edges = tuple(rou.split(' '))
+            groups[edges[0]].append(edges)
 
+    return tuple((k, tuple(sorted(rou))) for k, rou in sorted(groups.items()))
 
 def get_nodes(network_id):
     return get_generic_element(network_id, 'junction')
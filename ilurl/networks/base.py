@@ -4,6 +4,7 @@ __date__ = '2020-01-10'
 
 import os
 import operator as op
+from collections import defaultdict
 from itertools import groupby
 
 # Network related parameters
@@ -260,8 +261,11 @@ class Network(flownet.Network):
             * Wei et al., 2019
             http://arxiv.org/abs/1904.08117
         """
-        return {nid: [e['id'] for e in self.edges if e['to'] == nid]
-                for nid in self.tls_ids}
+        # index incoming edges by node: a single pass over edges
+        by_to = defaultdict(list)
+        for e in self.edges:
+            by_to[e['to']].append(e['id'])
+        return {nid: by_to.get(nid, []) for nid in self.tls_ids}
 
     @lazy_property
     def tls_phases(self):
@@ -320,39 +324,45 @@ class Network(flownet.Network):
         """
 
         _phases = {}
-        def fn(x, n):
-            return x.get('tl') == n and 'linkIndex' in x
+        # index controlled connections by traffic light
+        by_tl = defaultdict(list)
+        for c in self.connections:
+            if 'linkIndex' in c:
+                by_tl[c.get('tl')].append(c)
 
         for nid in self.tls_ids:
             # green and yellow are considered to be one phase
             _phases[nid] = {}
-            connections = [c for c in self.connections if fn(c, nid)]
             states = self.tls_states[nid]
             links = {
                 int(cn['linkIndex']):
                     (cn['from'], int(cn['fromLane']))
-                for cn in connections if 'linkIndex' in cn
+                for cn in by_tl[nid]
             }
+            # link indices are sorted once: bit k of a state's mask
+            # flags a green signal on link order[k]
+            order = sorted(links)
+            memo = {}
             i = 0
             components = {}
             for state in states:
-                # components: linkIndex, 0-1, edge_id, lane
-                components = {
-                    (lnk,) + edge_lane
-                    for lnk, edge_lane in links.items()
-                    if state[lnk] in ('G','g')
-                }
+                mask = 0
+                for k, lnk in enumerate(order):
+                    if state[lnk] in ('G','g'):
+                        mask |= 1 << k
                 # adds components if they don't exist
-                if components:
+                if mask:
                     found = False
-                    # sort by link, edge_id
-                    components = \
-                        sorted(components, key=op.itemgetter(0, 1))
-
-                    # groups lanes by edge_ids and states
-                    components = \
-                        [(k, list({l[-1] for l in g}))
-                         for k, g in groupby(components, key=op.itemgetter(1))]
+                    if mask not in memo:
+                        # edge_id, lane already sorted by link
+                        greens = [links[lnk] for k, lnk in enumerate(order)
+                                  if mask >> k & 1]
+
+                        # groups lanes by edge_ids and states
+                        memo[mask] = \
+                            [(k, list({l[-1] for l in g}))
+                             for k, g in groupby(greens, key=op.itemgetter(0))]
+                    components = memo[mask]
                     for j in range(0, i + 1):
                         if j in _phases[nid]:
                             # same edge_id and lanes
@@ -390,12 +400,13 @@ class Network(flownet.Network):
 
         """
         max_capacity = {}
+        edges = {e['id']: e for e in self.edges}
         for tls_id in self.tls_ids:
             _max_capacity = {}
             for phase, data in self.tls_phases[tls_id].items():
                 max_count, max_speed = 0, 0
                 for edge_id, lanes in data['components']:
-                    edge = [e for e in self.edges if e['id'] == edge_id][0]
+                    edge = edges[edge_id]
                     k = len(lanes) / edge['numLanes']
                     max_count += edge['max_capacity'] * k
                     max_speed = max(edge['max_speed'], max_speed)
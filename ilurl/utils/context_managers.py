@@ -1,14 +1,16 @@
 import sys
 import os
 
+# opened once and shared by every guard, it's never closed.
+_DEVNULL = open(os.devnull, 'w')
+
 
 class PipeGuard(object):
     """PipeGuard supresses stdout in order to prevent text outputs
     """
     def __enter__(self):
         self._stdout = sys.stdout
-        sys.stdout = open(os.devnull, 'w')
+        sys.stdout = _DEVNULL
 
     def __exit__(self, *args, **kwargs):
-        sys.stdout.close()
         sys.stdout = self._stdout
@@ -5,33 +5,39 @@ import functools
 def lazy_property(function):
     """Evaluates the function once creating a static method
 
-    It stores the result in a member named after the decorated
-    function (prepended with a prefix) and returns this value
-    on any subsequent calls.
+    It stores the result in the instance's __dict__, under the
+    decorated function's name, shadowing the (non-data) descriptor.
+    Subsequent calls are plain attribute lookups.
 
     Params:
         * function: function
             method or property to be decorated
     Returns:
-        * lazy_property: type<function>
+        * lazy_property: _LazyProperty
 
     References:
         https://danijar.com/structuring-your-tensorflow-models/
+        https://docs.python.org/3/howto/descriptor.html
 
     Decorators:
         functools.wraps
     """
+    return _LazyProperty(function)
 
-    attribute = '_cache_' + function.__name__
 
-    @property
-    @functools.wraps(function)
-    def decorator(self):
-        if not hasattr(self, attribute):
-            setattr(self, attribute, function(self))
-        return getattr(self, attribute)
+class _LazyProperty(object):
+    """Non-data descriptor backing `lazy_property`"""
 
-    return decorator
+    def __init__(self, function):
+        self.function = function
+        functools.update_wrapper(self, function)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = self.function(instance)
+        instance.__dict__[self.function.__name__] = value
+        return value
 
 
 def delegate_property(function):
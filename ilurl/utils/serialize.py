@@ -6,6 +6,7 @@
                     json dump storage.
 
 '''
+import pickle
 import re
 
 # dill allows to pickle lambda functions
@@ -53,8 +54,23 @@ class Serializer(object):
 
         file_path = '{:}{:}'.format(file_dir, filename)
         with open(file_path, 'wb') as f:
-            dill.dump(obj, f, protocol=dill.HIGHEST_PROTOCOL)
-
+            if attr_name is None:
+                dill.dump(obj, f, protocol=dill.HIGHEST_PROTOCOL)
+            else:
+                f.write(serialize(obj))
+
+
+def serialize(obj):
+    '''Pickles obj into bytes
+
+    Attributes e.g Q-tables are usually plain data: the C pickler
+    handles them without dill's overhead -- and the result is still
+    readable by `dill.load`. Falls back to dill otherwise.
+    '''
+    try:
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return dill.dumps(obj, protocol=dill.HIGHEST_PROTOCOL)
 
 def convert(name):
     s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
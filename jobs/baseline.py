@@ -10,6 +10,7 @@ TODO: Include config for evaluation
 from pathlib import Path
 from datetime import datetime
 import sys
+import os
 from os import environ
 import json
 import tempfile
@@ -152,20 +153,18 @@ def baseline_batch():
             for cfg in baseline_configs:
                 rvs.append(delay_baseline([cfg]))
         # Create a directory and move newly created files
-        paths = [Path(f) for f in rvs]
-        commons = [p.parent for p in paths]
-        if len(set(commons)) > 1:
-            raise ValueError(f'Directories {set(commons)} must have the same root')
-        dirpath = commons[0]
+        dirpath = os.path.dirname(rvs[0])
+        for f in rvs[1:]:
+            if os.path.dirname(f) != dirpath:
+                raise ValueError(f'Directories {dirpath} and '
+                                 f'{os.path.dirname(f)} must have the same root')
         timestamp = datetime.now().strftime('%Y%m%d%H%M%S.%f')
-        batchpath = dirpath / timestamp
-        if not batchpath.exists():
-            batchpath.mkdir()
+        batchpath = os.path.join(dirpath, timestamp)
+        os.makedirs(batchpath, exist_ok=True)
 
         # Move files
-        for src in paths:
-            dst = batchpath / src.parts[-1]
-            src.replace(dst)
+        for src in rvs:
+            os.rename(src, os.path.join(batchpath, os.path.basename(src)))
     sys.stdout.write(str(batchpath))
     return str(batchpath)
 
@@ -1,9 +1,9 @@
 from pathlib import Path
 from datetime import datetime
+import os
 import sys
 from os import environ
 import json
-import tempfile
 import argparse
 import multiprocessing as mp
 import time
@@ -12,12 +12,17 @@ from collections import defaultdict
 import configparser
 
 from ilurl.utils.decorators import processable
-from models.rollouts import roll
 
 ILURL_HOME = environ['ILURL_HOME']
 
 CONFIG_PATH = Path(f'{ILURL_HOME}/config/')
 
+# marks scalar params not yet seen by `concat`.
+_MISSING = object()
+
+# Assess total number of processors once.
+_CPU_COUNT = os.cpu_count() or 1
+
 
 def get_arguments():
     parser = argparse.ArgumentParser(
@@ -32,13 +37,17 @@ def get_arguments():
     sys.argv = [sys.argv[0]]
     return parsed
 
-def concat(evaluations):
+def concat(evaluations, result=None):
     """Receives an experiments' json and merges it's contents
 
     Params:
     -------
-        * evaluations: list
-        list of rollout evaluations
+        * evaluations: iterable
+        rollout evaluations, consumed one at a time
+
+        * result: dict
+        a previous `concat` output to be updated in place
+        defaults to a new result
 
     Returns:
     --------
@@ -48,35 +57,101 @@ def concat(evaluations):
               `numeric` params are appended
 
     """
-    result = defaultdict(list)
+    if result is None:
+        result = defaultdict(list)
+    # experiment id -> position on result['id']
+    id_to_idx = {exid: i for i, exid in enumerate(result.get('id', ()))}
+    append_keys = None
+    # first seen value of the scalar params
+    scalars = {}
     for qtb in evaluations:
-        exid = qtb.pop('id')
-        qid = qtb.get('rollouts', 0)[0]
+        exid = qtb['id']
+        qid = qtb['rollouts'][0]
+        if append_keys is None:
+            # evaluations share the same schema: partition it once
+            # `id` is only read -- evaluations are left untouched
+            append_keys = [k for k, v in qtb.items() if k != 'id' and
+                           (isinstance(v, list) or isinstance(v, dict))]
+            scalar_keys = [k for k in qtb
+                           if k != 'id' and k not in append_keys]
+            scalars = {k: result[k] for k in scalar_keys if k in result}
+
         # can either be a rollout from the prev
         # exid or a new experiment
-        if exid not in result['id']:
+        ex_idx = id_to_idx.get(exid)
+        if ex_idx is None:
+            ex_idx = len(result['id'])
+            id_to_idx[exid] = ex_idx
             result['id'].append(exid)
-
-        ex_idx = result['id'].index(exid)
-        for k, v in qtb.items():
-            append = isinstance(v, list) or isinstance(v, dict)
-            # check if integer fields match
-            # such as cycle, save_step, etc
-            if not append:
-                if k in result:
-                    if result[k] != v:
-                        raise ValueError(
-                            f'key:\t{k}\t{result[k]} and {v} should match'
-                        )
-                else:
-                    result[k] = v
-            else:
-                if ex_idx == len(result[k]):
-                    result[k].append(defaultdict(list))
-                result[k][ex_idx][qid].append(v)
+            # one entry per experiment on the united params
+            for k in append_keys:
+                result[k].append(defaultdict(list))
+
+        # check if integer fields match
+        # such as cycle, save_step, etc
+        for k in scalar_keys:
+            v = qtb[k]
+            prev = scalars.get(k, _MISSING)
+            if prev is _MISSING:
+                scalars[k] = v
+            elif prev is not v and prev != v:
+                raise ValueError(
+                    f'key:\t{k}\t{prev} and {v} should match'
+                )
+
+        for k in append_keys:
+            result[k][ex_idx][qid].append(qtb[k])
+    result.update(scalars)
     return result
 
 
+def walk_q(root):
+    """Yields the Q-tables' paths found under root
+
+    Only directories are descended into, file names are
+    matched without stat-ing the files, as `*Q*.pickle`.
+
+    Params:
+    ------
+    * root: string
+        directory to be searched recursively
+
+    Returns:
+    -------
+    * paths: generator<string>
+        paths to the Q-tables' pickle files
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif 'Q' in entry.name and entry.name.endswith('.pickle'):
+                    yield entry.path
+
+
+# models.rollouts pulls the simulator in, it's bound by `_preload`.
+roll = None
+
+
+def _preload():
+    """Imports `roll` once per process
+
+    Called on the parent before the pool is created, so forked
+    workers inherit it, and as the pool's initializer otherwise.
+    """
+    global roll
+    if roll is None:
+        from models.rollouts import roll as fn
+        roll = fn
+
+
+def _roll(args):
+    """Single argument wrapper around `roll` for `Pool.imap_unordered`"""
+    return roll(args=args)
+
+
 def rollout_batch(test=False, batch_dir=None):
 
     print('\nRUNNING jobs/rollouts.py\n')
@@ -89,54 +164,54 @@ def rollout_batch(test=False, batch_dir=None):
     else:
         batch_path = Path(batch_dir)
 
-    pattern = '*Q*.pickle'
+    # validates run.config before searching for Q-tables
+    run_config = configparser.ConfigParser()
+    run_config.read(str(CONFIG_PATH / 'run.config'))
+
+    num_processors = int(run_config.get('run_args', 'num_processors'))
+    num_runs = int(run_config.get('run_args', 'num_runs'))
+    train_seeds = json.loads(run_config.get("run_args", "train_seeds"))
+
+    if len(train_seeds) != num_runs:
+        raise configparser.Error('Number of seeds in run.config `train_seeds`'
+                        ' must match the number of runs (`num_runs`) argument.')
+
+    if len(set(train_seeds)) != num_runs:
+        raise configparser.Error('Seeds in run.config `train_seeds`'
+                        ' must be unique.')
+
     # for test this should get only the last pickle
-    rollout_paths = [rp for rp in batch_path.rglob(pattern)]
+    rollout_paths = list(walk_q(str(batch_path)))
 
     if test:
-        
+
         def fn(x):
-            # Filter using Q-table number.
-            q_number = int(x.suffixes[-2].split('-')[1])
+            # Filter using Q-table number e.g `<name>.Q.1-500.pickle`.
+            q_number = int(x.rsplit('.', 2)[-2].split('-')[1])
             return q_number
 
         # Get number of last Q-table.
-        max_Q = max(rollout_paths, key=fn)
-        max_Q = max_Q.suffixes[-2]
+        max_Q = max(map(fn, rollout_paths))
 
         # Select only the latest Q-tables.
-        rollout_paths = []
-        max_q_pattern = '*.Q{0}.pickle'.format(max_Q)
-        for path in Path(batch_path).rglob(max_q_pattern):
-            rollout_paths.append(str(path))
+        rollout_paths = [rp for rp in rollout_paths if fn(rp) == max_Q]
 
         print('jobs/rollouts.py (test mode): using Q-tables'
-                ' number {0}'.format(max_Q.split('-')[1]))
+                ' number {0}'.format(max_Q))
 
-    run_config = configparser.ConfigParser()
-    run_config.read(str(CONFIG_PATH / 'run.config'))
-
-    num_processors = int(run_config.get('run_args', 'num_processors'))
-    num_runs = int(run_config.get('run_args', 'num_runs'))
-    train_seeds = json.loads(run_config.get("run_args", "train_seeds"))
-
-    if len(train_seeds) != num_runs:
-        raise configparser.Error('Number of seeds in run.config `train_seeds`'
-                        'must match the number of runs (`num_runs`) argument.')
-
-    # Assess total number of processors.
-    processors_total = mp.cpu_count()
-    print(f'Total number of processors available: {processors_total}\n')
+    print(f'Total number of processors available: {_CPU_COUNT}\n')
 
     # Adjust number of processors.
-    if num_processors > processors_total:
-        num_processors = processors_total
+    if num_processors > _CPU_COUNT:
+        num_processors = _CPU_COUNT
         print(f'Number of processors downgraded to {num_processors}\n')
 
     # Read train.py arguments from train.config file.
     rollouts_config = configparser.ConfigParser()
     rollouts_config.read(str(CONFIG_PATH / 'rollouts.config'))
-    num_rollouts = int(rollouts_config.get('rollouts_args', 'num-rollouts'))
+    # extracts the rollouts' arguments once
+    rollouts_args = dict(rollouts_config.items('rollouts_args'))
+    num_rollouts = int(rollouts_args['num-rollouts'])
 
     if test:
         # merges test and rollouts
@@ -150,10 +225,10 @@ def rollout_batch(test=False, batch_dir=None):
         seed_delta = int(test_config.get('test_args', 'seed_delta'))
 
         # overwrite defaults
-        rollouts_config.set('rollouts_args', 'cycles', cycles)
-        rollouts_config.set('rollouts_args', 'emission', emission)
-        rollouts_config.set('rollouts_args', 'switch', switch)
-        rollouts_config.set('rollouts_args', 'num-rollouts', repr(num_rollouts))
+        rollouts_args['cycles'] = cycles
+        rollouts_args['emission'] = emission
+        rollouts_args['switch'] = switch
+        rollouts_args['num-rollouts'] = repr(num_rollouts)
 
         # alocates the S seeds among M rollouts
         custom_configs = []
@@ -182,38 +257,28 @@ def rollout_batch(test=False, batch_dir=None):
     \tNum. rollout repetitions: {num_rollouts}
     \tNum. rollout total: {len(rollout_paths) * num_rollouts}\n\n''')
 
-    with tempfile.TemporaryDirectory() as f:
-
-        tmp_path = Path(f)
-        # Create a config file for each rollout
-        # with the respective seed. These config
-        # files are stored in a temporary directory.
-        rollouts_cfg_paths = []
-        cfg_key = "rollouts_args"
-        for cfg in custom_configs:
-            rollout_path, seed = cfg
-
-            # Setup custom rollout settings
-            rollouts_config.set(cfg_key, "rollout-path", str(rollout_path))
-            rollouts_config.set(cfg_key, "rollout-seed", str(seed))
-            
-            # Write temporary train config file.
-            cfg_path = tmp_path / f'rollouts-{seed}.config'
-            rollouts_cfg_paths.append(str(cfg_path))
-            with cfg_path.open('w') as fw:
-                rollouts_config.write(fw)
-
-        # rvs: directories' names holding experiment data
-        if num_processors > 1:
-            pool = mp.Pool(num_processors)
-            rvs = pool.map(roll, [[cfg] for cfg in rollouts_cfg_paths])
-            pool.close()
-        else:
-            rvs = []
-            for cfg in rollouts_cfg_paths:
-                rvs.append(roll([cfg]))
-
-    res = concat(rvs)
+    # Command line arguments for each rollout with the
+    # respective seed -- parsed in memory by `roll`.
+    base_args = [f'--{k}={v}' for k, v in rollouts_args.items()
+                 if k not in ('rollout-path', 'rollout-seed')]
+    rollouts_args_list = [
+        base_args + [f'--rollout-path={rollout_path}',
+                     f'--rollout-seed={seed}']
+        for rollout_path, seed in custom_configs
+    ]
+
+    _preload()
+    if num_processors > 1:
+        # a few chunks per worker keeps them busy without
+        # paying one IPC round trip per rollout.
+        chunksize = max(1, len(rollouts_args_list) // (num_processors * 4))
+        with mp.Pool(num_processors, initializer=_preload) as pool:
+            # evaluations are merged as they arrive
+            res = concat(pool.imap_unordered(_roll, rollouts_args_list,
+                                             chunksize=chunksize))
+    else:
+        res = concat(map(_roll, rollouts_args_list))
+
     res['num_rollouts'] = num_rollouts
     filepart = 'test' if test else 'eval'
     filename = f'{batch_path.parts[-1]}.l.{filepart}.info.json'
@@ -1,4 +1,3 @@
-from pathlib import Path
 from datetime import datetime
 import sys
 import os
@@ -116,19 +115,17 @@ def train_batch():
                 rvs.append(delay_train([cfg]))
 
         # Create a directory and move newly created files
-        paths = [Path(f) for f in rvs]
-        commons = [p.parent for p in paths]
-        if len(set(commons)) > 1:
-            raise ValueError(f'Directories {set(commons)} must have the same root')
-        dirpath = commons[0]
-        batchpath = dirpath / timestamp
-        if not batchpath.exists():
-            batchpath.mkdir()
+        dirpath = os.path.dirname(rvs[0])
+        for f in rvs[1:]:
+            if os.path.dirname(f) != dirpath:
+                raise ValueError(f'Directories {dirpath} and '
+                                 f'{os.path.dirname(f)} must have the same root')
+        batchpath = os.path.join(dirpath, timestamp)
+        os.makedirs(batchpath, exist_ok=True)
 
         # Move files
-        for src in paths:
-            dst = batchpath / src.parts[-1]
-            src.replace(dst)
+        for src in rvs:
+            os.rename(src, os.path.join(batchpath, os.path.basename(src)))
 
     sys.stdout.write(str(batchpath))
     return str(batchpath)
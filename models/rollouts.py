@@ -13,7 +13,6 @@ __author__ = 'Guilherme Varela'
 __date__ = '2020-04-07'
 from os import environ
 from pathlib import Path
-import json
 import re
 import random
 from copy import deepcopy
@@ -21,6 +20,7 @@ from copy import deepcopy
 import configargparse
 import dill
 import numpy as np
+import orjson
 
 from flow.core.params import SumoParams, EnvParams
 from ilurl.core.params import QLParams
@@ -42,7 +42,7 @@ def search_Q(x):
     res, = found.groups()
     return int(res)
 
-def get_arguments(config_file_path):
+def get_arguments(config_file_path, args=None):
     if config_file_path is None:
         config_file_path = []
 
@@ -82,7 +82,7 @@ def get_arguments(config_file_path):
                         '''Rollout demand distribution can be either
                         `lane` or `switch` defaults to lane''')
 
-    return parser.parse_args()
+    return parser.parse_args(args)
 
 
 def str2bool(v):
@@ -165,8 +165,24 @@ def evaluate(env_params, sim_params, programs,
     return result
 
 
-def roll(config_file_path=None):
-    args = get_arguments(config_file_path)
+def roll(config_file_path=None, args=None):
+    """Performs a single rollout from a Q-table
+
+    Params:
+    -------
+        * config_file_path: list<string>
+            config files holding the rollout arguments
+
+        * args: list<string>
+            command line arguments e.g `['--rollout-seed=1']`
+            defaults to sys.argv
+
+    Returns:
+    --------
+        * info: dict
+        evaluation metrics for experiment
+    """
+    args = get_arguments(config_file_path, args)
     rollout_path = Path(args.rollout_path)
 
     # rollout_number = args.rollout_number
@@ -181,8 +197,7 @@ def roll(config_file_path=None):
     pattern = '*.params.json'
     params = None
     for params_path in rollout_path.parent.glob(pattern):
-        with params_path.open('r') as f:
-            params = json.load(f)
+        params = orjson.loads(params_path.read_bytes())
         break   # There should be only one match
     if params is None:
         raise ValueError('params is None')
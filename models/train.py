@@ -13,6 +13,7 @@ from  os import environ
 from pathlib import Path
 
 import numpy as np
+import orjson
 import random
 import configargparse
 from configargparse import ArgumentTypeError
@@ -21,7 +22,7 @@ import configparser
 from flow.core.params import EnvParams, SumoParams
 from flow.envs.ring.accel import ADDITIONAL_ENV_PARAMS
 
-from ilurl.core.experiment import Experiment
+from ilurl.core.experiment import Experiment, JSON_OPTIONS
 from ilurl.core.params import QLParams
 import ilurl.core.ql.dpq as ql
 from ilurl.envs.base import TrafficLightEnv
@@ -290,8 +291,7 @@ def main(train_config=None):
             f"{env.network.name}.train.json"
 
     result_path = experiment_path / filename
-    with result_path.open('w') as f:
-        json.dump(info_dict, f)
+    result_path.write_bytes(orjson.dumps(info_dict, option=JSON_OPTIONS))
 
     return str(experiment_path)
 
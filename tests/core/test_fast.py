@@ -0,0 +1,25 @@
+import unittest
+
+import numpy as np
+
+from ilurl.core._fast import flush, mean
+
+
+class TestFast(unittest.TestCase):
+    '''Tests the jit compiled save step reductions'''
+
+    def test_mean(self):
+        buf = np.array([1.0, 2.0, 100.0])
+        self.assertAlmostEqual(mean(buf, 2), 1.5)
+        self.assertTrue(np.isnan(mean(buf, 0)))
+
+    def test_flush(self):
+        buf = np.array([np.nan, 2.0, 4.0])
+        self.assertAlmostEqual(flush(buf, 3), 3.0)
+        self.assertAlmostEqual(flush(buf, 2), 2.0)
+        self.assertTrue(np.isnan(flush(buf, 1)))
+        self.assertTrue(np.isnan(flush(buf, 0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from ilurl.core.experiment import Experiment
+
+
+class StubVehicle(object):
+    """Odd steps hold two vehicles, even steps none"""
+    def __init__(self, env):
+        self.env = env
+
+    def get_ids(self):
+        return ['0', '1'] if self.env.t % 2 else []
+
+    def get_speed(self, veh_ids):
+        return [float(self.env.t + 2 * i) for i, _ in enumerate(veh_ids)]
+
+
+class StubEnv(object):
+    """Cycle time environment with an irregular save schedule"""
+    def __init__(self, save_steps):
+        self.save_steps = save_steps
+        self.sim_params = SimpleNamespace(sim_step=1)
+        self.cycle_time = 3
+        self.network = SimpleNamespace(name='stub')
+        self.tls_ids = ['0']
+        self.k = SimpleNamespace(vehicle=StubVehicle(self))
+        self.actions_log = {}
+        self.states_log = {}
+        self.agent = None
+        self.t = 0
+        self.duration = 1.0
+        self.Q = {'t': 0}
+
+    def dump(self, *args, **kwargs):
+        pass
+
+    def reset(self):
+        return None
+
+    def step(self, rl_actions):
+        self.t += 1
+        self.duration = 0.0 if self.t in self.save_steps else 1.0
+        self.Q = {'t': self.t}
+        return None, [float(self.t)], False, None
+
+    def get_observation_space(self):
+        return []
+
+    def terminate(self):
+        pass
+
+
+class TestExperimentRun(unittest.TestCase):
+    """Tests the save steps of `Experiment.run` against a stub env"""
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        # the second save is 5 steps apart: buffers hold 3 steps
+        self.env = StubEnv(save_steps={3, 8, 11, 14})
+        self.experiment = Experiment(self.env,
+                                     dir_path=self.tmp_dir.name,
+                                     save_agent=True,
+                                     save_agent_interval=2)
+        self.info = self.experiment.run(15)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_q_tables(self):
+        paths = sorted(Path(self.tmp_dir.name).glob('*.pickle'))
+        self.assertEqual([p.name for p in paths],
+                         ['stub.Q.1-0.pickle', 'stub.Q.1-2.pickle',
+                          'stub.Q.1-4.pickle'])
+        tables = [pickle.loads(p.read_bytes()) for p in paths]
+        self.assertEqual(tables, [{'t': 0}, {'t': 8}, {'t': 14}])
+
+    def test_rewards(self):
+        self.assertEqual(self.info['rewards'],
+                         [[3.0], [8.0], [11.0], [14.0]])
+
+    def test_vehicles(self):
+        self.assertEqual(self.info['vehicles'],
+                         [1.3333, 0.8, 1.3333, 0.6667])
+
+    def test_velocities(self):
+        self.assertEqual(self.info['velocities'],
+                         [3.0, 7.0, 11.0, 14.0])
+
+    def test_buffer_growth(self):
+        self.assertEqual(self.experiment._save_n, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from jobs.rollouts import concat
+
+
+def evaluation(exid, qid, seed, cycle=90):
+    return {'id': exid, 'rollouts': [qid], 'cycle': cycle,
+            'rewards': [seed * 0.1], 'velocities': [seed * 1.0],
+            'seed': [seed]}
+
+
+class TestConcat(unittest.TestCase):
+    '''Tests the merge of rollout evaluations'''
+
+    def test_ids(self):
+        evaluations = [evaluation('exA', 5, 0), evaluation('exB', 5, 1),
+                       evaluation('exA', 10, 2), evaluation('exB', 5, 3)]
+        result = concat(iter(evaluations))
+        self.assertEqual(result['id'], ['exA', 'exB'])
+        self.assertEqual(result['seed'], [{5: [[0]], 10: [[2]]},
+                                          {5: [[1], [3]]}])
+        self.assertEqual(result['cycle'], 90)
+
+    def test_evaluations_untouched(self):
+        evaluations = [evaluation('exA', 5, 0)]
+        concat(evaluations)
+        self.assertEqual(evaluations, [evaluation('exA', 5, 0)])
+
+    def test_scalar_mismatch(self):
+        evaluations = [evaluation('exA', 5, 0),
+                       evaluation('exB', 5, 1, cycle=60)]
+        with self.assertRaises(ValueError):
+            concat(evaluations)
+
+    def test_update_result(self):
+        evaluations = [evaluation('exA', 5, 0), evaluation('exB', 5, 1),
+                       evaluation('exA', 5, 2)]
+        result = concat(evaluations[:2])
+        updated = concat(evaluations[2:], result)
+        self.assertIs(updated, result)
+        self.assertEqual(updated, concat(evaluations))
+
+    def test_update_result_mismatch(self):
+        result = concat([evaluation('exA', 5, 0)])
+        with self.assertRaises(ValueError):
+            concat([evaluation('exA', 5, 1, cycle=60)], result)
+
+    def test_empty(self):
+        self.assertEqual(concat(iter([])), {})
+
+    def test_shared_id(self):
+        # emission rollouts report the batch directory as id
+        evaluations = [evaluation('batch', 5, seed) for seed in range(3)]
+        result = concat(iter(evaluations))
+        self.assertEqual(result['id'], ['batch'])
+        self.assertEqual(result['velocities'], [{5: [[0.0], [1.0], [2.0]]}])
+        self.assertEqual(result['seed'], [{5: [[0], [1], [2]]}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import xml.etree.ElementTree as ET
+
+from ilurl.loaders.nets import get_generic_element, get_path, get_routes
+
+
+class TestGetGenericElement(unittest.TestCase):
+    '''Tests streamed queries against a full parse'''
+
+    network_id = 'intersection'
+
+    def _findall(self, target, file_type='net'):
+        root = ET.parse(get_path(self.network_id, file_type)).getroot()
+        return [dict(elem.attrib) for elem in root.findall(target)]
+
+    def test_junctions(self):
+        self.assertEqual(get_generic_element(self.network_id, 'junction'),
+                         self._findall('junction'))
+
+    def test_connections(self):
+        self.assertEqual(get_generic_element(self.network_id, 'connection'),
+                         self._findall('connection'))
+
+    def test_edges_lanes(self):
+        edges = get_generic_element(self.network_id, 'edge',
+                                    ignore='function', child_key='lane')
+        root = ET.parse(get_path(self.network_id, 'net')).getroot()
+        expected = [
+            dict(elem.attrib,
+                 lanes=[dict(lane.attrib) for lane in elem.findall('lane')])
+            for elem in root.findall('edge') if 'function' not in elem.attrib
+        ]
+        self.assertEqual(edges, expected)
+
+    def test_nested_target(self):
+        routes = get_generic_element(self.network_id, 'vehicle/route',
+                                     file_type='rou', key='edges')
+        expected = [attr['edges']
+                    for attr in self._findall('vehicle/route', 'rou')]
+        self.assertEqual(routes, expected)
+
+    def test_results_are_copies(self):
+        nodes = get_generic_element(self.network_id, 'junction')
+        nodes[0].clear()
+        self.assertEqual(get_generic_element(self.network_id, 'junction'),
+                         self._findall('junction'))
+
+
+class TestGetRoutes(unittest.TestCase):
+    '''Tests routes grouping by starting edges'''
+
+    def test_routes(self):
+        routes = get_routes('intersection')
+        self.assertEqual(list(routes), sorted(routes))
+        for start, rous in routes.items():
+            edges = [r for r, _ in rous]
+            self.assertEqual(edges, sorted(edges))
+            self.assertEqual(len(edges), len({tuple(r) for r in edges}))
+            self.assertTrue(all(r[0] == start for r in edges))
+            self.assertAlmostEqual(sum(p for _, p in rous), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
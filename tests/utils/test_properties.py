@@ -0,0 +1,34 @@
+import unittest
+
+from ilurl.utils.properties import lazy_property
+
+
+class TestLazyProperty(unittest.TestCase):
+    class Foo(object):
+        def __init__(self):
+            self.calls = 0
+
+        @lazy_property
+        def bar(self):
+            """bar docstring"""
+            self.calls += 1
+            return [self.calls]
+
+    def test_evaluates_once(self):
+        foo = self.Foo()
+        self.assertEqual(foo.bar, [1])
+        self.assertEqual(foo.bar, [1])
+        self.assertEqual(foo.calls, 1)
+
+    def test_per_instance(self):
+        foo, bar = self.Foo(), self.Foo()
+        foo.bar
+        self.assertIn('bar', foo.__dict__)
+        self.assertNotIn('bar', bar.__dict__)
+
+    def test_docstring(self):
+        self.assertEqual(self.Foo.bar.__doc__, 'bar docstring')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,6 +25,18 @@ class TestSerialization(unittest.TestCase):
         g = self.Foo.load(self.dump_path + 'foo.pickle')
         self.assertEqual(f.foo, g.foo)
 
+    def test_load_attr(self):
+        f = self.Foo({(0, 1): {0: 0.5, 1: -0.25}})
+        f.dump(self.dump_path, 'foo', attr_name='foo')
+        g = self.Foo.load(self.dump_path + 'foo.pickle')
+        self.assertEqual(f.foo, g)
+
+    def test_load_attr_lambda(self):
+        f = self.Foo(lambda x: x + 1)
+        f.dump(self.dump_path, 'foo', attr_name='foo')
+        g = self.Foo.load(self.dump_path + 'foo.pickle')
+        self.assertEqual(g(1), 2)
+
     def tearDown(self):
         '''Remove pickles'''
         os.remove('{}{}'.format(self.dump_path, 'foo.pickle'))